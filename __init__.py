@@ -4,18 +4,20 @@ EZ Prompts - ComfyUI Template-based Prompt Generation
 
 from .nodes.ez_prompt_node import EZPromptsNode
 from .nodes.outpaint_by_aspect_ratio import PadImageForOutpaintByAspectRatio
-from .nodes.sort_batch_image_loader import LoadImageSetFromFolderSortedNode
+from .nodes.sort_batch_image_loader import LoadImageSetFromFolderSortedNode, LoadImageSetFromFolderSortedBucketedNode
 
 NODE_CLASS_MAPPINGS = {
     "EZPromptsNode": EZPromptsNode,
     "PadImageForOutpaintByAspectRatio": PadImageForOutpaintByAspectRatio,
-    "LoadImageSetFromFolderSortedNode": LoadImageSetFromFolderSortedNode
+    "LoadImageSetFromFolderSortedNode": LoadImageSetFromFolderSortedNode,
+    "LoadImageSetFromFolderSortedBucketedNode": LoadImageSetFromFolderSortedBucketedNode
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
     "EZPromptsNode": "EZ Prompts",
     "PadImageForOutpaintByAspectRatio": "Pad Image for Outpaint by Aspect Ratio",
-    "LoadImageSetFromFolderSortedNode": "Load Image Dataset from Folder (Sorted)"
+    "LoadImageSetFromFolderSortedNode": "Load Image Dataset from Folder (Sorted)",
+    "LoadImageSetFromFolderSortedBucketedNode": "Load Image Dataset from Folder (Sorted, Size Buckets)"
 }
 
 WEB_DIRECTORY = "./js"
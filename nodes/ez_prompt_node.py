@@ -3,8 +3,12 @@ import json
 import os
 import random
 from server import PromptServer
+import folder_paths
 from aiohttp import web
 
+from .prompt_export import EXPORT_FORMATS, get_export, start_export
+from .wildcard_index import is_large_wildcard, load_wildcard_choices
+
 class EZPromptsNode:
     """
     A node that dynamically creates input parameters based on selected templates
@@ -151,11 +155,14 @@ class EZPromptsNode:
             
             if os.path.exists(wildcard_path):
                 try:
-                    with open(wildcard_path, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
+                    if is_large_wildcard(wildcard_path):
+                        # Too many lines to list as dropdown choices; only "Random" is offered.
+                        # The index is built on the first draw, not on these UI requests.
+                        wildcards[wildcard_name] = []
+                        print(f"Large wildcard {wildcard_name}: choices not listed")
+                        continue
                     
-                    # Clean up lines and remove empty ones
-                    values = [line.strip() for line in lines if line.strip()]
+                    values = load_wildcard_choices(wildcard_path)
                     wildcards[wildcard_name] = values
                     print(f"Loaded wildcard {wildcard_name}: {values}")
                     
@@ -208,6 +215,83 @@ class EZPromptsNode:
         
         return info
 
+    def load_wildcard_file(self, wildcard_name):
+        """Read the choices of a wildcard file; returns None if the file does not exist"""
+        wildcard_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "wildcards", f"{wildcard_name}.txt")
+        if not os.path.exists(wildcard_path):
+            print(f"Wildcard file {wildcard_name}.txt not found")
+            return None
+        # Large files come back as an mmap-backed sequence, read one line per draw
+        return load_wildcard_choices(wildcard_path)
+    
+    def render_prompt(self, template_data, seed, wildcard_values, wildcard_choices=None, verbose=True, strict=False):
+        """
+        Substitute template parameters for a seed.
+        Returns the prompt text and the value chosen for each parameter.
+        wildcard_choices optionally maps wildcard names to preloaded choices.
+        With strict, a missing or unreadable wildcard file raises instead of giving "".
+        """
+        prompt_text = template_data["text"]
+        chosen_values = {}
+        
+        # Replace placeholders with parameter values from wildcard_values
+        for i, param in enumerate(template_data["parameters"]):
+            param_name = param["name"]
+            # Get value from wildcard_values (which comes from JavaScript widgets)
+            param_value = wildcard_values.get(param_name, "Random")
+            
+            if verbose:
+                print(f"Processing parameter: {param_name} = {param_value}")
+                print(f"  Available in wildcard_values: {param_name in wildcard_values}")
+                print(f"  Wildcard_values content: {wildcard_values}")
+            
+            # Handle "Random" values by selecting from available choices
+            if param_value == "Random":
+                # Get the choices from the wildcard file
+                wildcard_name = param.get("wildcard_file", "")
+                if wildcard_name:
+                    try:
+                        if wildcard_choices is not None and wildcard_name in wildcard_choices:
+                            available_choices = wildcard_choices[wildcard_name]
+                        else:
+                            available_choices = self.load_wildcard_file(wildcard_name)
+                        
+                        if available_choices is None and strict:
+                            raise FileNotFoundError(f"Wildcard file {wildcard_name}.txt not found")
+                        if available_choices:
+                            # Use derived seed for each wildcard to ensure consistency
+                            derived_seed = seed + i
+                            param_value = random.Random(derived_seed).choice(available_choices)
+                            if verbose:
+                                print(f"  Random selection for {param_name}: {param_value} (seed: {derived_seed})")
+                        else:
+                            param_value = ""
+                    except Exception as e:
+                        if strict:
+                            raise
+                        print(f"Error reading wildcard file {wildcard_name}: {e}")
+                        param_value = ""
+                else:
+                    param_value = ""
+            
+            # Convert to string if needed
+            if param_value is not None:
+                param_value = str(param_value)
+            else:
+                param_value = ""
+            
+            chosen_values[param_name] = param_value
+            
+            # Replace the placeholder
+            placeholder = "{" + param_name + "}"
+            old_text = prompt_text
+            prompt_text = prompt_text.replace(placeholder, param_value)
+            
+            if verbose and old_text != prompt_text:
+                print(f"  Replaced {placeholder} with '{param_value}'")
+        
+        return prompt_text, chosen_values
+
     def generate_prompt(self, template, mode=True, seed=0, wildcard_index=0, populated="", unique_id=None, extra_pnginfo=None, wildcard_params="{}"):
         """Generate the final prompt by substituting template parameters"""
         
@@ -289,62 +373,7 @@ class EZPromptsNode:
         print(f"Template text: {prompt_text}")
         print(f"Template parameters: {[param['name'] for param in template_data.get('parameters', [])]}")
         
-        # Set seed for deterministic randomization
-        random.seed(seed)
-        
-        # Replace placeholders with parameter values from wildcard_values
-        for i, param in enumerate(template_data["parameters"]):
-            param_name = param["name"]
-            # Get value from wildcard_values (which comes from JavaScript widgets)
-            param_value = wildcard_values.get(param_name, "Random")
-            
-            print(f"Processing parameter: {param_name} = {param_value}")
-            print(f"  Available in wildcard_values: {param_name in wildcard_values}")
-            print(f"  Wildcard_values content: {wildcard_values}")
-            
-            # Handle "Random" values by selecting from available choices
-            if param_value == "Random":
-                # Get the choices from the wildcard file
-                wildcard_name = param.get("wildcard_file", "")
-                if wildcard_name:
-                    wildcard_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "wildcards", f"{wildcard_name}.txt")
-                    if os.path.exists(wildcard_path):
-                        try:
-                            with open(wildcard_path, 'r', encoding='utf-8') as wf:
-                                lines = wf.readlines()
-                                # Clean up lines and remove empty ones
-                                available_choices = [line.strip() for line in lines if line.strip()]
-                            
-                            if available_choices:
-                                # Use derived seed for each wildcard to ensure consistency
-                                derived_seed = seed + i
-                                random.seed(derived_seed)
-                                param_value = random.choice(available_choices)
-                                print(f"  Random selection for {param_name}: {param_value} (seed: {derived_seed})")
-                            else:
-                                param_value = ""
-                        except Exception as e:
-                            print(f"Error reading wildcard file {wildcard_name}: {e}")
-                            param_value = ""
-                    else:
-                        print(f"Wildcard file {wildcard_name}.txt not found")
-                        param_value = ""
-                else:
-                    param_value = ""
-            
-            # Convert to string if needed
-            if param_value is not None:
-                param_value = str(param_value)
-            else:
-                param_value = ""
-            
-            # Replace the placeholder
-            placeholder = "{" + param_name + "}"
-            old_text = prompt_text
-            prompt_text = prompt_text.replace(placeholder, param_value)
-            
-            if old_text != prompt_text:
-                print(f"  Replaced {placeholder} with '{param_value}'")
+        prompt_text, _ = self.render_prompt(template_data, seed, wildcard_values)
         
         print(f"Final prompt: {prompt_text}")
         print("=" * 60)
@@ -424,4 +453,78 @@ async def get_wildcard_list(request):
     node = EZPromptsNode()
     wildcards = [{"name": name, "values": values} for name, values in node.wildcards.items()]
     print(f"Returning wildcard list: {wildcards}")
-    return web.json_response(wildcards)
\ No newline at end of file
+    return web.json_response(wildcards)
+
+@PromptServer.instance.routes.post("/api/custom/export")
+async def start_prompt_export(request):
+    try:
+        data = await request.json()
+    except json.JSONDecodeError:
+        return web.json_response({"error": "Invalid JSON body"}, status=400)
+    if not isinstance(data, dict):
+        return web.json_response({"error": "Expected a JSON object"}, status=400)
+    
+    template_name = data.get("template", "")
+    if not isinstance(template_name, str):
+        return web.json_response({"error": "template must be a string"}, status=400)
+    fmt = data.get("format", "jsonl")
+    if fmt not in EXPORT_FORMATS:
+        return web.json_response({"error": f"Unsupported format: {fmt}"}, status=400)
+    
+    try:
+        start = int(data.get("start", 0))
+        end = int(data["end"])
+    except (KeyError, ValueError, TypeError):
+        return web.json_response({"error": "start and end must be integers"}, status=400)
+    if start < 0 or end <= start:
+        return web.json_response({"error": "Expected 0 <= start < end"}, status=400)
+    
+    wildcard_values = data.get("wildcard_params", {})
+    if not isinstance(wildcard_values, dict):
+        return web.json_response({"error": "wildcard_params must be an object"}, status=400)
+    
+    resume = data.get("resume", True)
+    if not isinstance(resume, bool):
+        return web.json_response({"error": "resume must be a boolean"}, status=400)
+    
+    output_path = data.get("output_path", "")
+    if not isinstance(output_path, str):
+        return web.json_response({"error": "output_path must be a string"}, status=400)
+    
+    # Only allow writing inside the ComfyUI output directory; realpath resolves
+    # symlinks so a link inside it cannot redirect the export elsewhere
+    output_dir = os.path.realpath(folder_paths.get_output_directory())
+    output_path = os.path.realpath(os.path.join(output_dir, output_path))
+    if os.path.commonpath([output_dir, output_path]) != output_dir or output_path == output_dir:
+        return web.json_response({"error": "output_path must be a file inside the output directory"}, status=400)
+    
+    # Check the template file only; loading templates and wildcards (and building any
+    # wildcard indexes) happens on the export worker to keep the event loop responsive
+    templates_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+    if f"{template_name}.json" not in os.listdir(templates_dir):
+        return web.json_response({"error": "Template not found"}, status=404)
+    
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    try:
+        job = start_export(EZPromptsNode, template_name, output_path, fmt, start, end, wildcard_values,
+                           resume=resume)
+    except ValueError as e:
+        return web.json_response({"error": str(e)}, status=409)
+    
+    print(f"Started prompt export {job.id}: {template_name} [{start}, {end}) -> {output_path}")
+    return web.json_response(job.to_dict())
+
+@PromptServer.instance.routes.get("/api/custom/export/{job_id}")
+async def get_prompt_export(request):
+    job = get_export(request.match_info["job_id"])
+    if job is None:
+        return web.json_response({"error": "Export not found"}, status=404)
+    return web.json_response(job.to_dict())
+
+@PromptServer.instance.routes.post("/api/custom/export/{job_id}/cancel")
+async def cancel_prompt_export(request):
+    job = get_export(request.match_info["job_id"])
+    if job is None:
+        return web.json_response({"error": "Export not found"}, status=404)
+    job.cancelled = True
+    return web.json_response(job.to_dict())
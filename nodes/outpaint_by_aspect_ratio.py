@@ -117,21 +117,31 @@ class PadImageForOutpaintByAspectRatio:
             current_width, current_height, target_width, target_height
         )
         
-        # Perform image resize
-        resized = image.permute(0, 3, 1, 2)  # BHWC to BCHW
-        if interpolation == "lanczos":
-            resized = comfy.utils.lanczos(resized, new_width, new_height)
+        # Calculate required padding
+        pad_width = target_width - new_width
+        pad_height = target_height - new_height
+        
+        needs_resize = new_width != current_width or new_height != current_height
+        
+        # Image already has the target dimensions: nothing to resize, pad or feather
+        if not needs_resize and pad_width == 0 and pad_height == 0:
+            mask = torch.zeros((batch_size, current_height, current_width), device=image.device)
+            return (image, mask, current_width, current_height)
+        
+        # Perform image resize, skipped when only padding is needed
+        if not needs_resize:
+            resized = image
         else:
-            resized = F.interpolate(resized, size=(new_height, new_width), mode=interpolation)
-        resized = resized.permute(0, 2, 3, 1)  # Back to BHWC
+            resized = image.permute(0, 3, 1, 2)  # BHWC to BCHW
+            if interpolation == "lanczos":
+                resized = comfy.utils.lanczos(resized, new_width, new_height)
+            else:
+                resized = F.interpolate(resized, size=(new_height, new_width), mode=interpolation)
+            resized = resized.permute(0, 2, 3, 1)  # Back to BHWC
         
         # Create the initial mask for the resized image (zeros for original content)
         mask = torch.zeros((batch_size, 1, new_height, new_width), device=image.device)
         
-        # Calculate required padding
-        pad_width = target_width - new_width
-        pad_height = target_height - new_height
-        
         # Initialize padding values
         pad_left = pad_right = pad_top = pad_bottom = 0
         
@@ -0,0 +1,237 @@
+"""
+Background export of generated prompts to JSONL or CSV manifests.
+
+Each record holds the record index, its seed, the prompt and the value chosen for
+every template parameter. Records are written in batches through a buffered file.
+After each batch a ``<output>.progress`` sidecar stores the next index and the byte
+offset it was written at, so an interrupted export resumes where it stopped.
+Resuming with different wildcard_params is refused rather than mixing records.
+"""
+
+import csv
+import io
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+EXPORT_FORMATS = ("jsonl", "csv")
+EXPORT_BATCH_SIZE = 1000
+EXPORT_BUFFER_BYTES = 1024 * 1024
+PROGRESS_SUFFIX = ".progress"
+# Record fields written before the template parameters
+RECORD_FIELDS = ("index", "seed", "prompt")
+# Finished jobs kept for the status route; older ones are dropped
+MAX_FINISHED_JOBS = 50
+
+# A single worker keeps exports off the aiohttp loop without competing for the disk
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ez_prompts_export")
+_jobs: Dict[str, "ExportJob"] = {}
+_jobs_lock = threading.Lock()
+
+
+class ExportJob:
+    """State of one export, shared between the worker thread and the status route."""
+
+    def __init__(self, node_factory, template: str, output_path: str, fmt: str, start: int, end: int,
+                 wildcard_values: Dict[str, Any], resume: bool):
+        self.id = uuid.uuid4().hex
+        self.node_factory = node_factory
+        self.node = None
+        self.template = template
+        self.output_path = output_path
+        self.format = fmt
+        self.start = start
+        self.end = end
+        self.wildcard_values = wildcard_values
+        self.resume = resume
+
+        self.status = "queued"
+        self.next_index = start
+        self.error: Optional[str] = None
+        self.cancelled = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "template": self.template,
+            "output_path": self.output_path,
+            "format": self.format,
+            "start": self.start,
+            "end": self.end,
+            "status": self.status,
+            "next_index": self.next_index,
+            "written": self.next_index - self.start,
+            "total": self.end - self.start,
+            "error": self.error,
+        }
+
+
+def _read_progress(job: ExportJob) -> Optional[Dict[str, Any]]:
+    """Return the saved progress if it belongs to the same export and the output still exists"""
+    try:
+        with open(job.output_path + PROGRESS_SUFFIX, 'r', encoding='utf-8') as f:
+            progress = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.exists(job.output_path):
+        return None
+    if (progress.get("template"), progress.get("format"), progress.get("start")) != (job.template, job.format, job.start):
+        return None
+    if not job.start <= progress.get("next_index", -1) <= job.end:
+        return None
+    if progress.get("wildcard_params") != job.wildcard_values:
+        raise ValueError(
+            f"{job.output_path} was exported with different wildcard_params; "
+            "pass resume=false to overwrite it"
+        )
+    return progress
+
+
+def _write_progress(job: ExportJob, offset: int) -> None:
+    progress_path = job.output_path + PROGRESS_SUFFIX
+    tmp_path = progress_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "template": job.template,
+            "format": job.format,
+            "start": job.start,
+            "wildcard_params": job.wildcard_values,
+            "next_index": job.next_index,
+            "offset": offset,
+        }, f)
+    os.replace(tmp_path, progress_path)
+
+
+def _format_batch(records, fmt: str, fieldnames, header: bool = False) -> str:
+    if fmt == "jsonl":
+        return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    if header:
+        writer.writeheader()
+    writer.writerows(records)
+    return buffer.getvalue()
+
+
+def _notify(job: ExportJob) -> None:
+    try:
+        from server import PromptServer
+        PromptServer.instance.send_sync("ez_prompts.export.progress", job.to_dict())
+    except Exception as e:
+        print(f"Warning: Could not send export progress: {e}")
+
+
+def _open_output(job: ExportJob, progress: Optional[Dict[str, Any]], fieldnames):
+    if progress is not None:
+        # Drop anything written after the last completed batch
+        job.next_index = progress["next_index"]
+        f = open(job.output_path, 'r+', encoding='utf-8', newline='', buffering=EXPORT_BUFFER_BYTES)
+        f.seek(progress["offset"])
+        f.truncate()
+        print(f"Resuming export of {job.template} to {job.output_path} at index {job.next_index}")
+    else:
+        job.next_index = job.start
+        f = open(job.output_path, 'w', encoding='utf-8', newline='', buffering=EXPORT_BUFFER_BYTES)
+        f.write(_format_batch([], job.format, fieldnames, header=True))
+        f.flush()
+        _write_progress(job, f.tell())
+    return f
+
+
+def _run_export(job: ExportJob) -> None:
+    if job.cancelled:
+        job.status = "cancelled"
+        _notify(job)
+        return
+
+    job.status = "running"
+    try:
+        job.node = job.node_factory()
+        if job.template not in job.node.templates:
+            raise ValueError(f"Template {job.template} could not be loaded")
+        template_data = job.node.templates[job.template]
+        param_names = [param["name"] for param in template_data.get("parameters", [])]
+        reserved = sorted(set(param_names) & set(RECORD_FIELDS))
+        if reserved:
+            raise ValueError(
+                f"Template {job.template} has variables named {', '.join(reserved)}, "
+                "which clash with the record's own fields"
+            )
+        fieldnames = list(RECORD_FIELDS) + param_names
+
+        # Load each wildcard once for the whole export instead of once per record
+        wildcard_choices = {}
+        for param in template_data.get("parameters", []):
+            wildcard_name = param.get("wildcard_file")
+            if wildcard_name and wildcard_name not in wildcard_choices:
+                wildcard_choices[wildcard_name] = job.node.load_wildcard_file(wildcard_name)
+
+        progress = _read_progress(job) if job.resume else None
+
+        # Loading may have taken a while; don't touch the output if cancelled meanwhile
+        if job.cancelled:
+            job.status = "cancelled"
+            _notify(job)
+            return
+
+        with _open_output(job, progress, fieldnames) as f:
+            while job.next_index < job.end:
+                if job.cancelled:
+                    job.status = "cancelled"
+                    break
+
+                batch_end = min(job.next_index + EXPORT_BATCH_SIZE, job.end)
+                records = []
+                for index in range(job.next_index, batch_end):
+                    prompt, chosen_values = job.node.render_prompt(
+                        template_data, index, job.wildcard_values,
+                        wildcard_choices=wildcard_choices, verbose=False, strict=True
+                    )
+                    record = {"index": index, "seed": index, "prompt": prompt}
+                    record.update(chosen_values)
+                    records.append(record)
+
+                f.write(_format_batch(records, job.format, fieldnames))
+                f.flush()
+                job.next_index = batch_end
+                _write_progress(job, f.tell())
+                _notify(job)
+
+        if job.status == "running":
+            job.status = "done"
+            print(f"Export of {job.template} to {job.output_path} finished: {job.end - job.start} records")
+    except Exception as e:
+        job.status = "error"
+        job.error = str(e)
+        print(f"Error exporting prompts to {job.output_path}: {e}")
+    _notify(job)
+
+
+def _prune_finished_jobs() -> None:
+    finished = [job_id for job_id, job in _jobs.items() if job.status not in ("queued", "running")]
+    for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        del _jobs[job_id]
+
+
+def start_export(node_factory, template: str, output_path: str, fmt: str, start: int, end: int,
+                 wildcard_values: Dict[str, Any], resume: bool = True) -> ExportJob:
+    """
+    Queue an export on the background executor; raises ValueError if the output is already in use.
+    node_factory is called on the worker to load templates and wildcards off the event loop.
+    """
+    with _jobs_lock:
+        for job in _jobs.values():
+            if job.output_path == output_path and job.status in ("queued", "running"):
+                raise ValueError(f"An export to {output_path} is already in progress")
+        _prune_finished_jobs()
+        job = ExportJob(node_factory, template, output_path, fmt, start, end, wildcard_values, resume)
+        _jobs[job.id] = job
+    _executor.submit(_run_export, job)
+    return job
+
+
+def get_export(job_id: str) -> Optional[ExportJob]:
+    return _jobs.get(job_id)
@@ -1,6 +1,8 @@
 import os
 import re
-from typing import Any, Tuple, List
+from typing import Any, Dict, Tuple, List
+
+from PIL import Image
 
 from comfy.comfy_types.node_typing import IO
 import folder_paths
@@ -15,6 +17,34 @@ def _natural_key(s: str, case_sensitive: bool) -> Tuple[Any, ...]:
     return tuple(int(part) if part.isdigit() else part for part in re.split(r"(\d+)", s))
 
 
+VALID_EXTENSIONS = [".png", ".jpg", ".jpeg", ".webp", ".bmp", ".gif", ".jpe", ".apng", ".tif", ".tiff"]
+
+def _list_sorted_image_files(sub_input_dir: str, sort_order: str, natural_sort: bool, case_sensitive: bool) -> List[str]:
+    image_files: List[str] = [
+        f for f in os.listdir(sub_input_dir)
+        if any(f.lower().endswith(ext) for ext in VALID_EXTENSIONS)
+    ]
+
+    if sort_order != "None":
+        reverse = sort_order == "Descending"
+        if natural_sort:
+            image_files.sort(key=lambda s: _natural_key(s, case_sensitive), reverse=reverse)
+        else:
+            image_files.sort(key=(None if case_sensitive else str.lower), reverse=reverse)
+
+    return image_files
+
+
+def _probe_image_size(image_path: str) -> Tuple[int, int]:
+    """Read (width, height) from the image header without decoding pixel data.
+
+    EXIF orientation is deliberately ignored: load_and_process_images decodes
+    without transposing, so the raw header size is the size it produces.
+    """
+    with Image.open(image_path) as img:
+        return img.size
+
+
 class LoadImageSetFromFolderSortedNode:
     @classmethod
     def INPUT_TYPES(cls):
@@ -50,28 +80,76 @@ class LoadImageSetFromFolderSortedNode:
 
     def load_images(self, folder: str, resize_method: str, sort_order: str = "Ascending", natural_sort: bool = True, case_sensitive: bool = False):
         sub_input_dir = os.path.join(folder_paths.get_input_directory(), folder)
-
-        valid_extensions = [".png", ".jpg", ".jpeg", ".webp", ".bmp", ".gif", ".jpe", ".apng", ".tif", ".tiff"]
-        image_files: List[str] = [
-            f for f in os.listdir(sub_input_dir)
-            if any(f.lower().endswith(ext) for ext in valid_extensions)
-        ]
-
-        if sort_order != "None":
-            reverse = sort_order == "Descending"
-            if natural_sort:
-                image_files.sort(key=lambda s: _natural_key(s, case_sensitive), reverse=reverse)
-            else:
-                image_files.sort(key=(None if case_sensitive else str.lower), reverse=reverse)
+        image_files = _list_sorted_image_files(sub_input_dir, sort_order, natural_sort, case_sensitive)
 
         output_tensor = load_and_process_images(image_files, sub_input_dir, resize_method)
         return (output_tensor,)
 
 
+class LoadImageSetFromFolderSortedBucketedNode:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "folder": (folder_paths.get_input_subfolders(), {"tooltip": "The folder to load images from."}),
+            },
+            "optional": {
+                "sort_order": (
+                    ["Ascending", "Descending", "None"],
+                    {"default": "Ascending", "tooltip": "Sort images by filename."},
+                ),
+                "natural_sort": (
+                    IO.BOOLEAN,
+                    {"default": True, "tooltip": "Use natural sort (e.g. img2.png before img10.png)."},
+                ),
+                "case_sensitive": (
+                    IO.BOOLEAN,
+                    {"default": False, "tooltip": "Case-sensitive sorting."},
+                ),
+            },
+        }
+
+    RETURN_TYPES = ("IMAGE", IO.STRING)
+    RETURN_NAMES = ("images", "indices")
+    OUTPUT_IS_LIST = (True, True)
+    OUTPUT_TOOLTIPS = (
+        "One image batch per distinct image size.",
+        "Comma-separated positions of each batch's images in the sorted file order.",
+    )
+    FUNCTION = "load_images"
+    CATEGORY = "loaders"
+    EXPERIMENTAL = False
+    DESCRIPTION = "Loads images from a selected input subfolder, sorted by filename, as one batch per image size without resampling."
+
+    def load_images(self, folder: str, sort_order: str = "Ascending", natural_sort: bool = True, case_sensitive: bool = False):
+        sub_input_dir = os.path.join(folder_paths.get_input_directory(), folder)
+        image_files = _list_sorted_image_files(sub_input_dir, sort_order, natural_sort, case_sensitive)
+        if not image_files:
+            raise ValueError(f"No valid images found in folder: {folder}")
+
+        # Group by header size first so only same-size images are decoded together.
+        # Buckets keep the order in which their first image appears in the sorted list.
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for index, filename in enumerate(image_files):
+            size = _probe_image_size(os.path.join(sub_input_dir, filename))
+            buckets.setdefault(size, []).append(index)
+
+        output_tensors = []
+        output_indices = []
+        for indices in buckets.values():
+            bucket_files = [image_files[i] for i in indices]
+            output_tensors.append(load_and_process_images(bucket_files, sub_input_dir, "None"))
+            output_indices.append(",".join(str(i) for i in indices))
+
+        return (output_tensors, output_indices)
+
+
 NODE_CLASS_MAPPINGS = {
     "LoadImageSetFromFolderSortedNode": LoadImageSetFromFolderSortedNode,
+    "LoadImageSetFromFolderSortedBucketedNode": LoadImageSetFromFolderSortedBucketedNode,
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
     "LoadImageSetFromFolderSortedNode": "Load Image Dataset from Folder (Sorted)",
+    "LoadImageSetFromFolderSortedBucketedNode": "Load Image Dataset from Folder (Sorted, Size Buckets)",
 }
\ No newline at end of file
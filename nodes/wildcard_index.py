@@ -0,0 +1,182 @@
+"""
+Offset-indexed access to large wildcard files.
+
+Small wildcard files are read into a list of strings as before. Files of at least
+LARGE_WILDCARD_BYTES get a compact line-offset index stored next to them
+(``<name>.txt.idx``), and a random draw reads only its own line with a positioned
+read instead of loading the whole file. Reads go through the OS page cache, so pages
+are shared between processes and memory use does not grow with file size.
+The index is rebuilt automatically when the source changes.
+"""
+
+import os
+import re
+import struct
+import tempfile
+import threading
+from array import array
+from typing import Dict, List, Sequence, Union
+
+# Files at least this large are served from an on-disk index instead of a list
+LARGE_WILDCARD_BYTES = 8 * 1024 * 1024
+
+INDEX_SUFFIX = ".idx"
+_INDEX_MAGIC = b"EZWIDX2\0"
+# magic, source size, source mtime_ns, line count
+_INDEX_HEADER = struct.Struct("=8sQQQ")
+# byte range [start, end) of one line, without its terminator
+_LINE_RANGE = struct.Struct("=QQ")
+_BUILD_CHUNK_BYTES = 1024 * 1024
+
+# Line terminators recognised by text-mode reads (universal newlines)
+_LINE_END = re.compile(rb"\r\n|\r|\n")
+
+_open_files: Dict[str, "IndexedWildcardFile"] = {}
+# Serialises index rebuilds between the execution thread and the export worker
+_open_files_lock = threading.Lock()
+
+
+class StaleWildcardIndexError(RuntimeError):
+    """Raised when reading from an IndexedWildcardFile whose source has changed."""
+
+
+class IndexedWildcardFile:
+    """
+    Read-only sequence of the non-empty, stripped lines of a wildcard file.
+
+    Supports len() and indexing, so random.choice() picks the same value it would
+    pick from the equivalent list. No file handles or mappings are held between
+    reads, so the source and index can be rewritten or replaced at any time; reads
+    after the source changed raise StaleWildcardIndexError.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+
+        stat = os.stat(path)
+        self.source_size = stat.st_size
+        self.source_mtime_ns = stat.st_mtime_ns
+
+        if not self._index_is_current():
+            build_index(path)
+
+        with open(self.index_path, "rb") as f:
+            _, _, _, self._count = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+
+    def _index_is_current(self) -> bool:
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(_INDEX_HEADER.size)
+        except OSError:
+            return False
+        if len(header) != _INDEX_HEADER.size:
+            return False
+        magic, size, mtime_ns, _ = _INDEX_HEADER.unpack(header)
+        return magic == _INDEX_MAGIC and size == self.source_size and mtime_ns == self.source_mtime_ns
+
+    def is_stale(self) -> bool:
+        """Return True if the source file changed since this object was opened."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return True
+        return stat.st_size != self.source_size or stat.st_mtime_ns != self.source_mtime_ns
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("wildcard line index out of range")
+        if self.is_stale():
+            raise StaleWildcardIndexError(f"Wildcard file {self.path} changed since it was indexed")
+
+        with open(self.index_path, "rb") as f:
+            f.seek(_INDEX_HEADER.size + i * _LINE_RANGE.size)
+            entry = f.read(_LINE_RANGE.size)
+        if len(entry) != _LINE_RANGE.size:
+            raise StaleWildcardIndexError(f"Index for {self.path} was replaced while reading")
+        start, end = _LINE_RANGE.unpack(entry)
+
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            line = f.read(end - start)
+        return line.decode("utf-8").strip()
+
+
+def _append_line(ranges: array, buf: bytes, base: int, start: int, end: int) -> None:
+    # Mirror the list loader: keep only lines that are non-empty once stripped
+    if buf[start:end].decode("utf-8").strip():
+        ranges.append(base + start)
+        ranges.append(base + end)
+
+
+def build_index(path: str) -> None:
+    """Write the line-offset index for a wildcard file, replacing any existing one."""
+    stat = os.stat(path)
+    ranges = array("Q")
+
+    # Split lines like a text-mode read, in chunks so CR-only files stay bounded
+    base = 0
+    buf = b""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_BUILD_CHUNK_BYTES)
+            buf += chunk
+            # A trailing \r may be the first half of \r\n; wait for the next chunk
+            scan_end = len(buf) - 1 if chunk and buf.endswith(b"\r") else len(buf)
+            start = 0
+            for match in _LINE_END.finditer(buf, 0, scan_end):
+                _append_line(ranges, buf, base, start, match.start())
+                start = match.end()
+            if not chunk:
+                _append_line(ranges, buf, base, start, len(buf))
+                break
+            buf = buf[start:]
+            base += start
+
+    index_path = path + INDEX_SUFFIX
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(index_path), prefix=os.path.basename(index_path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(ranges) // 2))
+            ranges.tofile(f)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, index_path)
+
+
+def is_large_wildcard(path: str) -> bool:
+    return os.path.getsize(path) >= LARGE_WILDCARD_BYTES
+
+
+def load_wildcard_choices(path: str) -> Union[List[str], Sequence[str]]:
+    """
+    Return the choices of a wildcard file as an indexable sequence.
+
+    Large files are served through a cached IndexedWildcardFile; if the index cannot
+    be written (e.g. read-only install), the file is read into a list instead.
+    """
+    if is_large_wildcard(path):
+        with _open_files_lock:
+            wildcard_file = _open_files.get(path)
+            if wildcard_file is not None and not wildcard_file.is_stale():
+                return wildcard_file
+            # A stale entry is simply replaced; callers still holding it get
+            # StaleWildcardIndexError on their next read
+            try:
+                wildcard_file = IndexedWildcardFile(path)
+            except OSError as e:
+                print(f"Warning: Could not index wildcard file {path}, loading into memory: {e}")
+            else:
+                _open_files[path] = wildcard_file
+                return wildcard_file
+
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    # Clean up lines and remove empty ones
+    return [line.strip() for line in lines if line.strip()]
@@ -0,0 +1,178 @@
+"""
+The identity and padding-only fast paths of PadImageForOutpaintByAspectRatio must
+match the original resize/pad pipeline bit for bit, except for lanczos where the
+original path quantized through 8-bit PIL images.
+"""
+
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+torch = pytest.importorskip("torch")
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+F = torch.nn.functional
+
+
+def _lanczos(samples, width, height):
+    # Same as comfy.utils.lanczos: round-trips each image through 8-bit PIL
+    images = [Image.fromarray(np.clip(255. * image.movedim(0, -1).cpu().numpy(), 0, 255).astype(np.uint8)) for image in samples]
+    images = [image.resize((width, height), resample=Image.Resampling.LANCZOS) for image in images]
+    images = [torch.from_numpy(np.array(image).astype(np.float32) / 255.0).movedim(-1, 0) for image in images]
+    return torch.stack(images).to(samples.device, samples.dtype)
+
+
+def _load_node_module():
+    comfy = types.ModuleType("comfy")
+    comfy_utils = types.ModuleType("comfy.utils")
+    comfy_utils.lanczos = _lanczos
+    comfy.utils = comfy_utils
+    sys.modules.setdefault("comfy", comfy)
+    sys.modules.setdefault("comfy.utils", comfy_utils)
+
+    path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "nodes", "outpaint_by_aspect_ratio.py")
+    spec = importlib.util.spec_from_file_location("outpaint_by_aspect_ratio", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+outpaint = _load_node_module()
+
+
+def _baseline_process_image(node, image, target_ratio, padding_position, interpolation, feathering, multiple_of):
+    """process_image as it was before the fast paths: always resample, pad and feather."""
+    batch_size, current_height, current_width, channels = image.shape
+
+    target_width, target_height = node.get_target_dimensions(target_ratio)
+    if multiple_of > 1:
+        target_width = target_width - (target_width % multiple_of)
+        target_height = target_height - (target_height % multiple_of)
+
+    new_width, new_height = node.calculate_resize_dimensions(
+        current_width, current_height, target_width, target_height
+    )
+
+    resized = image.permute(0, 3, 1, 2)
+    if interpolation == "lanczos":
+        resized = _lanczos(resized, new_width, new_height)
+    else:
+        resized = F.interpolate(resized, size=(new_height, new_width), mode=interpolation)
+    resized = resized.permute(0, 2, 3, 1)
+
+    mask = torch.zeros((batch_size, 1, new_height, new_width), device=image.device)
+
+    pad_width = target_width - new_width
+    pad_height = target_height - new_height
+    pad_left = pad_right = pad_top = pad_bottom = 0
+    is_portrait = target_height > target_width
+
+    if padding_position == "center":
+        pad_left = pad_width // 2
+        pad_right = pad_width - pad_left
+        pad_top = pad_height // 2
+        pad_bottom = pad_height - pad_top
+    elif padding_position == "top/left":
+        pad_left = pad_width if not is_portrait else 0
+        pad_top = pad_height if is_portrait else 0
+    else:
+        pad_right = pad_width if not is_portrait else 0
+        pad_bottom = pad_height if is_portrait else 0
+
+    padded_image = F.pad(resized.permute(0, 3, 1, 2), (pad_left, pad_right, pad_top, pad_bottom), mode='constant', value=0.5)
+    padded_mask = F.pad(mask, (pad_left, pad_right, pad_top, pad_bottom), mode='constant', value=1.0)
+
+    if feathering > 0:
+        def create_feather(size):
+            return torch.linspace(0, 1, min(feathering, size), device=image.device)
+
+        if pad_left > 0:
+            start_idx = pad_left - min(feathering, pad_left)
+            padded_mask[:, :, :, start_idx:pad_left] = create_feather(min(feathering, pad_left)).flip(0).view(1, 1, 1, -1)
+        if pad_right > 0:
+            end_idx = padded_mask.shape[3] - pad_right
+            padded_mask[:, :, :, end_idx:end_idx + min(feathering, pad_right)] = create_feather(min(feathering, pad_right)).view(1, 1, 1, -1)
+        if pad_top > 0:
+            start_idx = pad_top - min(feathering, pad_top)
+            padded_mask[:, :, start_idx:pad_top, :] = create_feather(min(feathering, pad_top)).flip(0).view(1, 1, -1, 1)
+        if pad_bottom > 0:
+            end_idx = padded_mask.shape[2] - pad_bottom
+            padded_mask[:, :, end_idx:end_idx + min(feathering, pad_bottom), :] = create_feather(min(feathering, pad_bottom)).view(1, 1, -1, 1)
+
+        image_feather_mask = 1 - padded_mask
+        feathered_image = padded_image * image_feather_mask
+        background = torch.ones_like(padded_image) * 0.5
+        padded_image = feathered_image + (background * (1 - image_feather_mask))
+
+    final_image = padded_image.permute(0, 2, 3, 1)
+    final_mask = padded_mask.squeeze(1)
+    return (final_image, final_mask, final_image.shape[2], final_image.shape[1])
+
+
+def _random_image(height, width):
+    generator = torch.Generator().manual_seed(0)
+    return torch.rand((2, height, width, 3), generator=generator)
+
+
+# (image height, image width, target ratio): already 1024x1024, and 1024x512 which
+# only needs vertical padding to reach 1:1 at scale 1.0
+IDENTITY = (1024, 1024, "1:1")
+PAD_ONLY = (512, 1024, "1:1")
+EXACT_MODES = ["nearest-exact", "bilinear", "bicubic", "area"]
+
+
+@pytest.mark.parametrize("interpolation", EXACT_MODES)
+@pytest.mark.parametrize("case", [IDENTITY, PAD_ONLY], ids=["identity", "pad_only"])
+@pytest.mark.parametrize("feathering", [0, 16])
+@pytest.mark.parametrize("padding_position", ["center", "top/left", "bottom/right"])
+def test_fast_path_matches_baseline(interpolation, case, feathering, padding_position):
+    height, width, ratio = case
+    image = _random_image(height, width)
+    node = outpaint.PadImageForOutpaintByAspectRatio()
+
+    args = (image, ratio, padding_position, interpolation, feathering, 8)
+    image_out, mask_out, width_out, height_out = node.process_image(*args)
+    expected_image, expected_mask, expected_width, expected_height = _baseline_process_image(node, *args)
+
+    assert torch.equal(image_out, expected_image)
+    assert torch.equal(mask_out, expected_mask)
+    assert mask_out.dtype == expected_mask.dtype
+    assert (width_out, height_out) == (expected_width, expected_height)
+
+
+def test_identity_returns_input_tensor():
+    image = _random_image(1024, 1024)
+    node = outpaint.PadImageForOutpaintByAspectRatio()
+
+    image_out, mask_out, _, _ = node.process_image(image, "1:1", "center", "lanczos", 0, 8)
+
+    assert image_out is image
+    assert torch.equal(mask_out, torch.zeros((2, 1024, 1024)))
+
+
+@pytest.mark.parametrize("case", [IDENTITY, PAD_ONLY], ids=["identity", "pad_only"])
+def test_lanczos_fast_path_keeps_full_precision(case):
+    height, width, ratio = case
+    image = _random_image(height, width)
+    node = outpaint.PadImageForOutpaintByAspectRatio()
+
+    args = (image, ratio, "center", "lanczos", 0, 8)
+    image_out, mask_out, _, _ = node.process_image(*args)
+    expected_image, expected_mask, _, _ = _baseline_process_image(node, *args)
+
+    # Content region: the fast path keeps the input values, the old path quantized
+    # them to 8 bits (PIL returns a same-size copy, so only the uint8 cast differs)
+    top = (1024 - height) // 2
+    bottom = top + height
+    assert torch.equal(image_out[:, top:bottom], image)
+    quantized = torch.from_numpy(np.clip(255. * image.numpy(), 0, 255).astype(np.uint8).astype(np.float32) / 255.0)
+    assert torch.equal(expected_image[:, top:bottom], quantized)
+    assert not torch.equal(image_out, expected_image)
+
+    # Padding and mask are unaffected
+    assert torch.equal(image_out[:, :top], expected_image[:, :top])
+    assert torch.equal(image_out[:, bottom:], expected_image[:, bottom:])
+    assert torch.equal(mask_out, expected_mask)
@@ -0,0 +1,201 @@
+"""
+Prompt export: manifests must be complete, resumable after an interruption without
+duplicated or torn records, and must never mix records from different exports.
+"""
+
+import csv
+import importlib.util
+import json
+import os
+import random
+
+import pytest
+
+
+def _load_module():
+    path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "nodes", "prompt_export.py")
+    spec = importlib.util.spec_from_file_location("prompt_export", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+prompt_export = _load_module()
+
+COLORS = ["red", "green, blue", 'say "hi"', "naïve"]
+
+
+class FakeNode:
+    """Stands in for EZPromptsNode, which needs a running ComfyUI to import."""
+
+    templates = {
+        "portrait": {
+            "text": "a {color} coat, {mood}",
+            "parameters": [
+                {"name": "color", "wildcard_file": "colors"},
+                {"name": "mood", "wildcard_file": "moods"},
+            ],
+        },
+        "clash": {
+            "text": "{seed}",
+            "parameters": [{"name": "seed", "wildcard_file": "colors"}],
+        },
+    }
+    fail_at = None
+
+    def load_wildcard_file(self, wildcard_name):
+        return COLORS if wildcard_name == "colors" else ["calm", "bold"]
+
+    def render_prompt(self, template_data, seed, wildcard_values, wildcard_choices=None, verbose=True, strict=False):
+        if seed == self.fail_at:
+            raise RuntimeError(f"wildcard changed at {seed}")
+        chosen_values = {}
+        prompt_text = template_data["text"]
+        for i, param in enumerate(template_data["parameters"]):
+            value = wildcard_values.get(param["name"], "Random")
+            if value == "Random":
+                value = random.Random(seed + i).choice(wildcard_choices[param["wildcard_file"]])
+            chosen_values[param["name"]] = value
+            prompt_text = prompt_text.replace("{" + param["name"] + "}", value)
+        return prompt_text, chosen_values
+
+
+def _failing_node(index):
+    node = FakeNode()
+    node.fail_at = index
+    return node
+
+
+@pytest.fixture(autouse=True)
+def _small_batches(monkeypatch):
+    monkeypatch.setattr(prompt_export, "EXPORT_BATCH_SIZE", 7)
+    monkeypatch.setattr(prompt_export, "_notify", lambda job: None)
+
+
+def _export(output_path, fmt="jsonl", start=0, end=50, wildcard_values=None, resume=True,
+            template="portrait", node_factory=FakeNode):
+    # Run on the calling thread so each test sees the finished job
+    job = prompt_export.ExportJob(node_factory, template, str(output_path), fmt, start, end,
+                                  wildcard_values or {}, resume)
+    prompt_export._run_export(job)
+    return job
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def _progress(path):
+    with open(str(path) + prompt_export.PROGRESS_SUFFIX, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_jsonl_records(tmp_path):
+    output = tmp_path / "out.jsonl"
+    job = _export(output, start=5, end=25)
+
+    assert job.status == "done"
+    records = [json.loads(line) for line in _read(output).splitlines()]
+    assert [r["index"] for r in records] == list(range(5, 25))
+    for record in records:
+        prompt, values = FakeNode().render_prompt(FakeNode.templates["portrait"], record["seed"], {},
+                                                  wildcard_choices={"colors": COLORS, "moods": ["calm", "bold"]})
+        assert record == {"index": record["seed"], "seed": record["seed"], "prompt": prompt, **values}
+
+
+def test_csv_records(tmp_path):
+    output = tmp_path / "out.csv"
+    job = _export(output, fmt="csv", end=20, wildcard_values={"mood": "quiet"})
+
+    assert job.status == "done"
+    with open(output, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0].keys()) == ["index", "seed", "prompt", "color", "mood"]
+    assert [int(r["index"]) for r in rows] == list(range(20))
+    assert all(r["mood"] == "quiet" for r in rows)
+    assert all(r["prompt"] == f"a {r['color']} coat, quiet" for r in rows)
+
+
+@pytest.mark.parametrize("fmt", prompt_export.EXPORT_FORMATS)
+def test_resume_after_interruption_matches_uninterrupted_export(tmp_path, fmt):
+    expected = tmp_path / f"expected.{fmt}"
+    _export(expected, fmt=fmt)
+
+    output = tmp_path / f"out.{fmt}"
+    failed = _export(output, fmt=fmt, node_factory=lambda: _failing_node(23))
+    assert failed.status == "error"
+    # Only whole batches before the failure are recorded
+    assert _progress(output)["next_index"] == 21
+
+    # A torn record left behind by a crash mid-write is dropped on resume
+    with open(output, "a", encoding="utf-8") as f:
+        f.write('{"index": 21, "se')
+
+    resumed = _export(output, fmt=fmt)
+    assert resumed.status == "done"
+    assert _read(output) == _read(expected)
+
+
+def test_resume_refuses_different_wildcard_params(tmp_path):
+    output = tmp_path / "out.jsonl"
+    _export(output, end=14, node_factory=lambda: _failing_node(10))
+    before = _read(output)
+
+    job = _export(output, end=14, wildcard_values={"mood": "quiet"})
+
+    assert job.status == "error"
+    assert "wildcard_params" in job.error
+    assert _read(output) == before
+
+
+def test_resume_false_starts_over(tmp_path):
+    output = tmp_path / "out.jsonl"
+    _export(output, end=14, node_factory=lambda: _failing_node(10))
+
+    job = _export(output, end=14, wildcard_values={"mood": "quiet"}, resume=False)
+
+    assert job.status == "done"
+    records = [json.loads(line) for line in _read(output).splitlines()]
+    assert [r["index"] for r in records] == list(range(14))
+    assert all(r["mood"] == "quiet" for r in records)
+
+
+def test_different_range_start_overwrites(tmp_path):
+    output = tmp_path / "out.jsonl"
+    _export(output, end=14)
+
+    _export(output, start=100, end=103)
+
+    assert [json.loads(line)["index"] for line in _read(output).splitlines()] == [100, 101, 102]
+
+
+def test_render_error_fails_job_without_advancing(tmp_path):
+    output = tmp_path / "out.jsonl"
+    job = _export(output, node_factory=lambda: _failing_node(0))
+
+    assert job.status == "error"
+    assert "wildcard changed" in job.error
+    assert _read(output) == ""
+    assert _progress(output)["next_index"] == 0
+
+
+def test_reserved_variable_names_are_rejected(tmp_path):
+    output = tmp_path / "out.jsonl"
+    job = _export(output, template="clash")
+
+    assert job.status == "error"
+    assert "seed" in job.error
+    assert not output.exists()
+
+
+def test_cancelled_before_start_leaves_output_untouched(tmp_path):
+    output = tmp_path / "out.jsonl"
+    output.write_text("existing\n", encoding="utf-8")
+
+    job = prompt_export.ExportJob(FakeNode, "portrait", str(output), "jsonl", 0, 10, {}, False)
+    job.cancelled = True
+    prompt_export._run_export(job)
+
+    assert job.status == "cancelled"
+    assert _read(output) == "existing\n"
@@ -0,0 +1,115 @@
+"""
+Indexed wildcard files must yield exactly the choices, and seeded draws, of the
+text-mode list loader, and must rebuild or fail cleanly when the source changes.
+"""
+
+import importlib.util
+import os
+import random
+
+import pytest
+
+
+def _load_module():
+    path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "nodes", "wildcard_index.py")
+    spec = importlib.util.spec_from_file_location("wildcard_index", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+wildcard_index = _load_module()
+
+
+@pytest.fixture(autouse=True)
+def _small_threshold(monkeypatch):
+    # Index everything, and use tiny build chunks so \r\n is split across reads
+    monkeypatch.setattr(wildcard_index, "LARGE_WILDCARD_BYTES", 1)
+    monkeypatch.setattr(wildcard_index, "_BUILD_CHUNK_BYTES", 3)
+    monkeypatch.setattr(wildcard_index, "_open_files", {})
+
+
+def _write(path, content, mtime_ns=None):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _list_loader(path):
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+CONTENTS = {
+    "lf": "red\ngreen\nblue\n",
+    "crlf": "red\r\ngreen\r\n\r\nblue\r\n",
+    "cr": "red\rgreen\rblue\r",
+    "mixed": "red\n\r\ngreen\r\rblue\r\nteal\nnavy",
+    "whitespace_lines": "red\n   \n\t\n　\n  green  \n blue \n",
+    "no_trailing_newline": "red\ngreen\nblue",
+    "unicode": "café\rüber\r\nnaïve\n",
+    "whitespace_only": " \n\t\r\n\r",
+}
+
+
+@pytest.mark.parametrize("content", CONTENTS.values(), ids=CONTENTS.keys())
+def test_matches_list_loader(tmp_path, content):
+    path = str(tmp_path / "colors.txt")
+    _write(path, content)
+
+    choices = wildcard_index.load_wildcard_choices(path)
+    expected = _list_loader(path)
+
+    assert isinstance(choices, wildcard_index.IndexedWildcardFile)
+    assert list(choices) == expected
+    assert len(choices) == len(expected)
+    if expected:
+        for seed in range(50):
+            assert random.Random(seed).choice(choices) == random.Random(seed).choice(expected)
+
+
+def test_rebuilds_when_source_changes(tmp_path):
+    path = str(tmp_path / "colors.txt")
+    _write(path, "red\ngreen\n", mtime_ns=1_000_000_000)
+    first = wildcard_index.load_wildcard_choices(path)
+    assert list(first) == ["red", "green"]
+    assert wildcard_index.load_wildcard_choices(path) is first
+
+    _write(path, "cyan\rmagenta\ryellow\r", mtime_ns=2_000_000_000)
+    second = wildcard_index.load_wildcard_choices(path)
+
+    assert second is not first
+    assert list(second) == ["cyan", "magenta", "yellow"]
+    # A fresh object reuses the rebuilt index instead of building it again
+    index_mtime = os.stat(path + wildcard_index.INDEX_SUFFIX).st_mtime_ns
+    assert list(wildcard_index.IndexedWildcardFile(path)) == ["cyan", "magenta", "yellow"]
+    assert os.stat(path + wildcard_index.INDEX_SUFFIX).st_mtime_ns == index_mtime
+
+
+def test_stale_object_raises_after_truncation(tmp_path):
+    path = str(tmp_path / "colors.txt")
+    _write(path, "".join(f"line {i}\n" for i in range(5000)), mtime_ns=1_000_000_000)
+    held = wildcard_index.load_wildcard_choices(path)
+    assert held[4999] == "line 4999"
+
+    # Rewritten in place while a reference is held
+    _write(path, "", mtime_ns=2_000_000_000)
+    with pytest.raises(wildcard_index.StaleWildcardIndexError):
+        held[4999]
+
+    # Rebuilding for other callers leaves the held object failing the same way
+    _write(path, "only\n", mtime_ns=3_000_000_000)
+    assert list(wildcard_index.load_wildcard_choices(path)) == ["only"]
+    with pytest.raises(wildcard_index.StaleWildcardIndexError):
+        held[0]
+
+
+def test_small_files_use_list_loader(tmp_path, monkeypatch):
+    monkeypatch.setattr(wildcard_index, "LARGE_WILDCARD_BYTES", 1024)
+    path = str(tmp_path / "colors.txt")
+    _write(path, "red\r\ngreen\n")
+
+    assert wildcard_index.load_wildcard_choices(path) == ["red", "green"]
+    assert not os.path.exists(path + wildcard_index.INDEX_SUFFIX)